@@ -1,3 +1,4 @@
+import os
 import platform
 
 SYSTEM_PLATFORM = platform.system()
@@ -16,4 +17,6 @@ STANDARD_INSTALL_DIRS = [
     "/usr/bin",
     "/usr/local/bin",
     "/opt"
-]
\ No newline at end of file
+]
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "resource-checker", "latest.json")
+CACHE_TTL = int(os.environ.get("RESOURCE_CHECKER_CACHE_TTL", 86400))
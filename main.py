@@ -1,10 +1,52 @@
 import os
+import re
+import json
+import time
+import tempfile
+import threading
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+from typing import NamedTuple, Optional
 from glob import glob
-from bs4 import BeautifulSoup
 
-from config.settings import SYSTEM_PLATFORM, RESOURCES, STANDARD_INSTALL_DIRS
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+from config.settings import SYSTEM_PLATFORM, RESOURCES, STANDARD_INSTALL_DIRS, CACHE_FILE, CACHE_TTL
+
+
+_IS_WINDOWS = (SYSTEM_PLATFORM == "Windows")
+_WIN_EXEC_EXT = ('.exe', '.cmd', '.bat')
+_PATHEXT = [ext for ext in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").lower().split(os.pathsep) if ext]
+
+# Shared session so repeat fetches reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2)))
+SESSION.headers.update({"Accept-Encoding": "gzip"})
+REQUEST_TIMEOUT = (3, 10)
+_CACHE_LOCK = threading.Lock()
+_PY_VERSION_RE = re.compile(r'<span class="release-number">\s*<a[^>]*>\s*Python\s+([\d.]+)\s*</a>')
+# Cap on version-probe processes running at the same time
+_PROCESS_SLOTS = threading.BoundedSemaphore(16)
+# Version output keyed by (real binary path, version args)
+_VERSION_CACHE = {}
+# Per-key locks so concurrent callers wait on one probe instead of spawning their own
+_VERSION_LOCKS = {}
+_VERSION_LOCKS_LOCK = threading.Lock()
+
+
+class PathInfo(NamedTuple):
+    """Details gathered for a single discovered path."""
+    executable: bool
+    version: Optional[str]
+    in_path: bool
 
 
 # Log the environment variables that are important
@@ -18,80 +60,194 @@ def log_environment_variables():
     return env_vars
 
 
-def is_executable(file_path):
-    """Check if a file is executable."""
-    if SYSTEM_PLATFORM == "Windows":
-        return os.path.isfile(file_path) and file_path.endswith(('.exe', '.cmd', '.bat'))
-    else:
-        return os.access(file_path, os.X_OK)
-    
+def _is_executable_win(file_path):
+    """Check if a file is executable on Windows."""
+    return os.path.isfile(file_path) and file_path.endswith(_WIN_EXEC_EXT)
+
+
+def _is_executable_posix(file_path):
+    """Check if a file is executable on POSIX systems."""
+    return os.access(file_path, os.X_OK)
+
+
+# Pick the platform check once instead of branching on every call
+is_executable = _is_executable_win if _IS_WINDOWS else _is_executable_posix
+
+
+SKIP_DIRS = {"node_modules", ".git", "$recycle.bin"}
+
+# Wildcards such as C:\Users\*\AppData\Local are expanded once per process
+_EXPANDED_INSTALL_DIRS = []
+for _dir_pattern in STANDARD_INSTALL_DIRS:
+    _EXPANDED_INSTALL_DIRS.extend(glob(_dir_pattern))
 
-def run_command(cmd):
-    """Run a shell command and return its output as a list of lines."""
-    try:
-        output = subprocess.check_output(cmd, shell=True, stderr=subprocess.STDOUT, text=True).strip()
-        return output.splitlines()
-    except subprocess.CalledProcessError:
-        return []
-    
 
-def search_in_standard_dirs(resource):
-    """Search for the resource in standard installation directories."""
-    matches = []
-    for dir_pattern in STANDARD_INSTALL_DIRS:
-        for path in glob(os.path.join(dir_pattern, "**", resource), recursive=True):
-            if os.access(path, os.X_OK):  # Check if it's executable
-                matches.append(path)
+def _walk(roots, targets):
+    """Walk the given roots with os.scandir and collect files whose name is in targets."""
+    if _IS_WINDOWS:
+        lookup = {target.lower(): target for target in targets}
+    else:
+        lookup = {target: target for target in targets}
+    matches = {target: [] for target in targets}
+    stack = list(roots)
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name.lower() if _IS_WINDOWS else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif name in lookup and entry.is_file():
+                        matches[lookup[name]].append(entry.path)
+        except OSError:
+            continue
     return matches
 
 
+def search_in_standard_dirs(targets):
+    """Search for all target resources in standard installation directories in a single pass."""
+    return _walk(_EXPANDED_INSTALL_DIRS, targets)
+
+
+def normalize_dir(directory):
+    """Normalise a directory so PATH entries and discovered paths compare equal."""
+    return os.path.normcase(os.path.normpath(directory))
+
+
 def list_uncovered_path_dirs(covered_dirs):
     """List directories in PATH that were not scanned."""
-    path_dirs = os.environ.get("PATH", "").split(os.pathsep)
-    uncovered_dirs = [d for d in path_dirs if d and d not in covered_dirs]
+    path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+    uncovered_dirs = [d for d in path_dirs if normalize_dir(d) not in covered_dirs]
     return uncovered_dirs
 
 
+@lru_cache(maxsize=None)
+def _list_path_dir(directory):
+    """List a PATH directory once per process, keyed by (case-folded on Windows) entry name."""
+    try:
+        with os.scandir(directory) as entries:
+            if _IS_WINDOWS:
+                return {entry.name.lower(): entry.path for entry in entries}
+            return {entry.name: entry.path for entry in entries}
+    except OSError:
+        return {}
+
+
 def find_executable_paths(command):
-    """Find all paths to a given command."""
-    if SYSTEM_PLATFORM == "Windows":
-        cmd = f"where {command}"
+    """Find all paths to a given command by scanning the directories in PATH."""
+    if _IS_WINDOWS:
+        command = command.lower()
+        names = [command] + [command + ext for ext in _PATHEXT]
     else:
-        cmd = f"which -a {command}"
-    return run_command(cmd)
+        names = [command]
+
+    paths = []
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if not directory:
+            continue
+        listing = _list_path_dir(directory)
+        for name in names:
+            path = listing.get(name)
+            if path and os.path.isfile(path) and (_IS_WINDOWS or os.access(path, os.X_OK)):
+                paths.append(path)
+    return paths
 
 
 def get_version(command, version_args="--version"):
-    """Get the version of a given path."""
+    """Get the version of a given path, probing each real binary only once."""
+    key = (os.path.realpath(command), version_args)
+    with _VERSION_LOCKS_LOCK:
+        key_lock = _VERSION_LOCKS.setdefault(key, threading.Lock())
+    with key_lock:
+        if key not in _VERSION_CACHE:
+            _VERSION_CACHE[key] = _probe_version(command, version_args)
+        return _VERSION_CACHE[key]
+
+
+def _probe_version(command, version_args):
+    """Run the binary with its version arguments and return the first line of output."""
     try:
-        output = subprocess.check_output(
-            [command] + [version_args], stderr=subprocess.STDOUT, text=True
-        ).strip()
-        return output.splitlines()[0]  # First line often contains the version
+        with _PROCESS_SLOTS:
+            proc = subprocess.run(
+                [command, version_args], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=3, check=True
+            )
+        # First line often contains the version, so only that line is decoded
+        return proc.stdout.strip().split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+    except subprocess.TimeoutExpired:
+        return "Error: timeout"
     except Exception as e:
         return f"Error: {e}"
     
 
+def load_version_cache():
+    """Load the on-disk cache of latest versions, keyed by URL."""
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_version_cache(url, value):
+    """Store a latest version in the on-disk cache, replacing the file atomically."""
+    with _CACHE_LOCK:
+        cache = load_version_cache()
+        cache[url] = {"ts": time.time(), "value": value}
+        try:
+            os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE))
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, CACHE_FILE)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=None)
 def get_latest_version(url):
+    """Return the latest version of a resource, using the on-disk cache while it is fresh."""
+    entry = load_version_cache().get(url)
+    if (
+        isinstance(entry, dict)
+        and isinstance(entry.get("ts"), (int, float))
+        and "value" in entry
+        and time.time() - entry["ts"] < CACHE_TTL
+    ):
+        return entry["value"]
+    version = fetch_latest_version(url)
+    if not version.startswith(("Error", "Failed")):
+        save_version_cache(url, version)
+    return version
+
+
+def fetch_latest_version(url):
     """Fetch the latest version of a resource from its official website."""
     try:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             if "nodejs" in url:
-                response = requests.get("https://nodejs.org/dist/index.json")
+                response = SESSION.get("https://nodejs.org/dist/index.json", timeout=REQUEST_TIMEOUT)
                 response_data = response.json()[0]
                 version = response_data.get('version', 'Unknown version')
                 date = response_data.get('date', 'Unknown version')
                 return f"{version} ({date})"
             if "python" in url:
                 # Python example: looks for the latest version on the Python homepage
-                start = response.text.find('<span class="release-number">') + len('<span class="release-number">')
-                soup = BeautifulSoup(response.text, 'html.parser')
-                #print(soup)
-                end = response.text.find('</span>', start)
-                return response.text[start:end].strip()
+                if HTMLParser is not None:
+                    node = HTMLParser(response.text).css_first('span.release-number a')
+                    return node.text(strip=True).replace("Python", "", 1).strip() if node else "Unknown"
+                match = _PY_VERSION_RE.search(response.text)
+                return match.group(1) if match else "Unknown"
             if "npmjs" in url:
-                response = requests.get("https://registry.npmjs.org/npm/latest")
+                response = SESSION.get("https://registry.npmjs.org/npm/latest", timeout=REQUEST_TIMEOUT)
                 return response.json().get('version', 'Unknown version')
             return "Latest version info not found"
         else:
@@ -101,6 +257,13 @@ def get_latest_version(url):
     
 
 
+def fetch_all_latest(resources):
+    """Fetch the latest version of every resource concurrently, keyed by resource."""
+    urls = [url for _, url in resources.values()]
+    with ThreadPoolExecutor(max_workers=max(1, len(urls))) as executor:
+        return dict(zip(resources, executor.map(get_latest_version, urls)))
+
+
 def get_path_details(path, version_args):
     executable = is_executable(path)
     version = get_version(path, version_args) if executable else None
@@ -111,95 +274,105 @@ def get_resources(search_standard_dirs=False):
     resource_results = {}
     covered_dirs = set()
 
-    for resource, details in RESOURCES.items():
-        version_args, url = details
-        lv = get_latest_version(url)
-        paths = find_executable_paths(resource)
-        extra_paths = []
-        if search_standard_dirs: 
-            extra_paths = search_in_standard_dirs(resource)
-        resource_results[resource] = {'online_details': {'latest_version': lv, 'url': url}, 'paths': {}}
-
-        for path in paths:
-            executable, version = get_path_details(path, version_args)
-            resource_results[resource]['paths'][path] = {"Executable": executable, "Version": version, "InPath": True}
-        for path in extra_paths:
-            executable, version = get_path_details(path, version_args)
-            resource_results[resource]['paths'][path] = {"Executable": executable, "Version": version, "InPath": False}
-            covered_dirs.update(os.path.dirname(path))
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(RESOURCES) * 4))) as executor:
+        # One traversal of the standard directories covers every resource
+        standard_future = executor.submit(search_in_standard_dirs, set(RESOURCES)) if search_standard_dirs else None
+
+        # Online lookups run in the background while local paths are probed
+        latest_future = executor.submit(fetch_all_latest, RESOURCES)
+        lookups = {resource: executor.submit(find_executable_paths, resource) for resource in RESOURCES}
+
+        standard_paths = standard_future.result() if standard_future else {}
+
+        path_futures = {}
+        for resource, paths_future in lookups.items():
+            version_args, url = RESOURCES[resource]
+            resource_results[resource] = {'online_details': {'latest_version': None, 'url': url}, 'paths': {}}
+            extra_paths = standard_paths.get(resource, [])
+
+            # Symlinks to an already listed binary are skipped
+            targets = {}
+            real_paths = {}
+            for path, in_path in [(p, True) for p in paths_future.result()] + [(p, False) for p in extra_paths]:
+                if not in_path:
+                    covered_dirs.add(normalize_dir(os.path.dirname(path)))
+                if real_paths.setdefault(os.path.realpath(path), path) == path:
+                    targets[path] = in_path
+
+            for path, in_path in targets.items():
+                # Reserve the slot so the report keeps discovery order
+                resource_results[resource]['paths'][path] = None
+                future = executor.submit(get_path_details, path, version_args)
+                path_futures[future] = (resource, path, in_path)
+
+        for future in as_completed(path_futures):
+            resource, path, in_path = path_futures[future]
+            executable, version = future.result()
+            resource_results[resource]['paths'][path] = PathInfo(executable, version, in_path)
+
+        for resource, lv in latest_future.result().items():
+            resource_results[resource]['online_details']['latest_version'] = lv
 
     return resource_results, covered_dirs
 
 
 
-def print_hierarchy(report, current, path_counts, indent=2):
+def print_hierarchy(current, indent=2):
     """
-    Recursively prints a hierarchy of directories and the number of paths at each level.
+    Recursively yields a hierarchy of directories and the number of paths at each level.
 
-    :param report: List to append hierarchy lines.
-    :param current: Current level of the hierarchy.
-    :param path_counts: Dictionary mapping directory paths to their respective counts.
+    :param current: Current level of the path trie built by build_path_counts.
     :param indent: Current indentation level.
     """
-    for key, subdir in sorted(current.items()):
-        path = "\\".join([key] + list(subdir.keys()))
-        count = path_counts.get(path, 0)
-        report.append(f"{' ' * indent}{key} ({count})\\")
-        print_hierarchy(report, subdir, path_counts, indent + 2)
+    for key, node in sorted(current.items(), key=itemgetter(0)):
+        yield f"{' ' * indent}{key} ({node['_count']}){os.sep}"
+        yield from print_hierarchy(node['_children'], indent + 2)
 
 
-def build_path_counts(resource_results):
+def build_path_counts(paths):
     """
-    Build a dictionary of path counts for each directory level.
+    Build a trie of path components, counting the paths that pass through each level.
 
-    :param resource_results: The resources and their respective paths.
-    :return: Dictionary with path counts for each directory.
+    :param paths: The paths to add to the trie.
+    :return: Nested dict mapping each component to its count and children.
     """
-    path_counts = {}
-    for resource_details in resource_results.values():
-        for path in resource_details['paths']:
-            parts = path.split("\\")
-            for i in range(1, len(parts) + 1):
-                sub_path = "\\".join(parts[:i])
-                path_counts[sub_path] = path_counts.get(sub_path, 0) + 1
-    return path_counts
-
-
-def generate_report(resource_results, covered_dirs):
-    report = []
-    path_counts = build_path_counts(resource_results)
-
+    trie = {}
+    for path in paths:
+        node = {'_children': trie}
+        for part in os.path.normpath(path).split(os.sep):
+            if not part:
+                continue
+            node = node['_children'].setdefault(part, {'_count': 0, '_children': {}})
+            node['_count'] += 1
+    return trie
+
+
+def iter_report(resource_results, covered_dirs):
+    """Yield the report one line at a time."""
     for resource, resource_details in resource_results.items():
-        report.append(f"{resource}: {'No paths found' if len(resource_details['paths']) == 0 else ''}")
-        report.append(f"\tLatest Available Version: {resource_details['online_details']['latest_version']}  -  {resource_details['online_details']['url']}")
-        hierarchy = {}
+        yield f"{resource}: {'No paths found' if len(resource_details['paths']) == 0 else ''}"
+        yield f"\tLatest Available Version: {resource_details['online_details']['latest_version']}  -  {resource_details['online_details']['url']}"
         for path, details in resource_details['paths'].items():
-            if details['Executable'] == True:
-                report.append(f"\tPath: {path}")
-                report.append(f"\t\t\tExecutable: {details['Executable']}")
-                report.append(f"\t\t\tVersion: {details['Version']}")
-                report.append(f"\t\t\tIn-Path Variable: {details['InPath']}")
-            if details['InPath'] == False:
-                parts = path.split('\\')
-                current = hierarchy
-                for part in parts:
-                    current = current.setdefault(part, {})
-
-        print_hierarchy(report, hierarchy, path_counts)
-        report.append("")
+            if details.executable == True:
+                yield f"\tPath: {path}"
+                yield f"\t\t\tExecutable: {details.executable}"
+                yield f"\t\t\tVersion: {details.version}"
+                yield f"\t\t\tIn-Path Variable: {details.in_path}"
+
+        hierarchy = build_path_counts(path for path, details in resource_details['paths'].items() if details.in_path == False)
+        yield from print_hierarchy(hierarchy)
+        yield ""
 
     uncovered_dirs = list_uncovered_path_dirs(covered_dirs)
     if uncovered_dirs:
-        report.append("Uncovered PATH Directories:")
-        report.extend(f"  {d}" for d in uncovered_dirs)
-    report.append("")
+        yield "Uncovered PATH Directories:"
+        yield from (f"  {d}" for d in uncovered_dirs)
+    yield ""
 
     env_vars = log_environment_variables()
-    report.append("Environment Variables:")
+    yield "Environment Variables:"
     for var, value in env_vars.items():
-        report.append(f"  {var}: {value}")
- 
-    return report
+        yield f"  {var}: {value}"
 
 
 def prompt_for_update(resource_name):
@@ -220,17 +393,16 @@ def prompt_for_update(resource_name):
     
 
 def save_report(report, filename="resource_report.txt"):
-    """Save the report to a file."""
+    """Stream the report lines into a file."""
     report_path = os.path.join(os.getcwd(), filename)
-    with open(report_path, "w") as f:
-        f.write("\n".join(report))
+    with open(report_path, "w", buffering=1 << 16) as f:
+        f.writelines(line + "\n" for line in report)
     return report_path
 
 
 def main():
     resource_results, covered_dirs = get_resources()
-    report = generate_report(resource_results, covered_dirs)
-    report_path = save_report(report)
+    report_path = save_report(iter_report(resource_results, covered_dirs))
     print(f"Report generated: {report_path}")
 
     # Ask user if they want to update each resource